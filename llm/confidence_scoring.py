@@ -1,5 +1,7 @@
 import re
-from typing import Dict
+from typing import Dict, Optional
+
+from llm.material_recognizer import MaterialRecognizer, default_recognizer
 
 
 class ConfidenceScorer:
@@ -7,6 +9,9 @@ class ConfidenceScorer:
     Deterministic confidence scoring for extracted blueprint fields.
     """
 
+    def __init__(self, material_recognizer: Optional[MaterialRecognizer] = None):
+        self.material_recognizer = material_recognizer or default_recognizer()
+
     def score_dimension(self, item: Dict, full_ocr_text: str) -> float:
         score = 0.0
 
@@ -41,10 +46,42 @@ class ConfidenceScorer:
 
         return round(min(max(score, 0.0), 1.0), 2)
 
-    def score_material(self, item: Dict) -> float:
+    def score_material(
+        self,
+        item: Dict,
+        full_ocr_text: Optional[str] = None,
+        reported_standard: Optional[str] = None
+    ) -> float:
+        """
+        `reported_standard` is the LLM's own standard before
+        canonicalization; it corroborates the catalog hit when it
+        names the same grade.
+        """
         score = 0.0
-        source = item.get("source_text", "")
+        source = item.get("source_text") or ""
+
+        match = self.material_recognizer.canonicalize(source)
+
+        if match:
+            # 1. Known catalog designation
+            score += 0.75
+
+            # 2. LLM independently reported the same grade
+            reported = self.material_recognizer.canonicalize(reported_standard or "")
+            if reported and reported["standard"] == match["standard"]:
+                score += 0.20
+
+            # 3. Clean designation (no O/0 or I/1 folding needed)
+            if not match["noisy"]:
+                score += 0.05
+
+            # 4. No OCR evidence (LLM-reported source not in the OCR text)
+            if full_ocr_text is not None and source.lower() not in full_ocr_text.lower():
+                score -= 0.40
+
+            return round(min(max(score, 0.0), 1.0), 2)
 
+        # Fallback: unknown designation, pattern heuristics only
         if re.search(r"SS\d+|ASTM|AISI|ISO", source):
             score += 0.50
 
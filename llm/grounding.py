@@ -39,38 +39,32 @@ class GroundingEngine:
         ocr_lines = ocr_text.splitlines()
 
         for dim in dimensions:
-            source = dim.get("source_text", "")
-            result = self._best_match(source, ocr_lines)
-
-            dim["grounding"] = result
-
-            # penalize confidence if grounding weak
-            if not result["matched"]:
-                dim["confidence"] = round(dim["confidence"] * 0.7, 2)
+            self.ground_dimension(dim, ocr_lines)
 
         return dimensions
-    
-    def ground_dimensions(self, dimensions, ocr_text):
-        ocr_lines = ocr_text.splitlines()
 
-        for dim in dimensions:
-            source = dim.get("source_text", "")
-            result = self._best_match(source, ocr_lines)
+    def ground_dimension(self, dim: Dict, ocr_lines: List[str]) -> Dict:
+        """
+        Ground a single dimension against pre-split OCR lines.
+        Used directly by the streaming pipeline as each dimension arrives.
+        """
+        source = dim.get("source_text", "")
+        result = self._best_match(source, ocr_lines)
 
-            ambiguous = self._has_ocr_numeric_ambiguity(
-                result["ocr_line"] or ""
-            )
+        ambiguous = self._has_ocr_numeric_ambiguity(
+            result["ocr_line"] or ""
+        )
 
-            # treat ambiguous numeric match as weak grounding
-            if ambiguous:
-                result["matched"] = False
+        # treat ambiguous numeric match as weak grounding
+        if ambiguous:
+            result["matched"] = False
 
-            dim["grounding"] = result
+        dim["grounding"] = result
 
-            if not result["matched"]:
-                dim["confidence"] = round(dim["confidence"] * 0.7, 2)
+        if not result["matched"]:
+            dim["confidence"] = round(dim["confidence"] * 0.7, 2)
 
-        return dimensions
+        return dim
 
 
     def _has_ocr_numeric_ambiguity(self, text: str) -> bool:
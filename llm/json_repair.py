@@ -0,0 +1,229 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Marker key set on LLM output that only parsed after repair.
+# The adapter surfaces it as metadata["json_repaired"].
+REPAIRED_FLAG = "_json_repaired"
+
+MAX_REPAIR_CHARS = 200_000
+
+CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONRepairError(ValueError):
+    """Raised when LLM output cannot be structurally recovered."""
+
+
+def _strip_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```(json)?", "", text, flags=re.IGNORECASE).strip()
+        text = re.sub(r"```$", "", text).strip()
+    return text
+
+
+def _drop_trailing_comma(out: List[str]):
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ",":
+        del out[j]
+
+
+def _close(out: List[str], stack: List[str]) -> str:
+    text = out[:]
+    _drop_trailing_comma(text)
+    return "".join(text) + "".join(CLOSERS[c] for c in reversed(stack))
+
+
+def _at_member_boundary(stack: List[str]) -> bool:
+    """
+    True inside the top object or directly inside a top-level array,
+    i.e. where each member / element can be kept or dropped as a whole.
+    """
+    return len(stack) == 1 or len(stack) == 2 and stack[1] == "["
+
+
+def _loads(text: str) -> Any:
+    return json.loads(text, strict=False)
+
+
+def _last_significant(out: List[str]) -> str:
+    for ch in reversed(out):
+        if not ch.isspace():
+            return ch
+    return ""
+
+
+def repair_json(
+    text: str,
+    max_chars: int = MAX_REPAIR_CHARS,
+    required_key: Optional[str] = "dimensions"
+) -> Tuple[Dict, bool]:
+    """
+    Parse LLM output into a JSON object, repairing common damage.
+
+    Returns (data, repaired). Handles, in one bounded linear scan:
+    - prose or markdown fences around the JSON
+    - trailing commas before } or ]
+    - stray / mismatched closing brackets
+    - truncated output: complete top-level members and complete
+      elements of top-level arrays (e.g. dimensions[]) are kept,
+      the partially generated tail is dropped
+
+    Raises JSONRepairError if no JSON object can be recovered, if a
+    truncated reply keeps no complete member / array element, or if a
+    truncated reply lacks `required_key` or keeps it as an empty array
+    (None disables that check).
+    """
+    stripped = _strip_fences(text)
+
+    # Fast path: valid JSON needs no repair
+    try:
+        data = _loads(stripped)
+        if isinstance(data, dict):
+            return data, False
+    except json.JSONDecodeError:
+        pass
+
+    start = text.find("{")
+    if start < 0:
+        raise JSONRepairError("No JSON object found in model output")
+
+    source = text[start:start + max_chars]
+
+    out: List[str] = []
+    stack: List[str] = []
+    in_string = False
+    escape = False
+    closed = False
+
+    # complete top-level members / top-level array elements seen so far
+    completed = 0
+
+    # (output length, open containers, completed) at boundaries where
+    # everything before is a complete member or top-level array element
+    checkpoint = (0, [], 0)
+
+    for ch in source:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in "{[":
+            stack.append(ch)
+            out.append(ch)
+            if _at_member_boundary(stack):
+                checkpoint = (len(out), stack[:], completed)
+        elif ch in "}]":
+            if ch == "}" and "{" not in stack or ch == "]" and "[" not in stack:
+                continue  # stray closer
+
+            # close anything left open inside the matching container
+            opener = "{" if ch == "}" else "["
+            while stack:
+                _drop_trailing_comma(out)
+                top = stack.pop()
+                out.append(CLOSERS[top])
+                if top == opener:
+                    break
+
+            if not stack:
+                closed = True
+                break
+        elif ch == ",":
+            if _at_member_boundary(stack):
+                _drop_trailing_comma(out)
+                if _last_significant(out) not in "{[":
+                    completed += 1
+                checkpoint = (len(out), stack[:], completed)
+            out.append(ch)
+        else:
+            out.append(ch)
+
+    # (candidate text, complete members / elements it keeps)
+    candidates = []
+
+    if closed:
+        candidates.append(("".join(out), None))
+    else:
+        # truncated: closing in place is only safe outside nested items
+        if not in_string and _at_member_boundary(stack):
+            tail_complete = _last_significant(out) not in "{[,:"
+            candidates.append((_close(out, stack), completed + int(tail_complete)))
+
+        length, open_stack, kept = checkpoint
+        candidates.append((_close(out[:length], open_stack), kept))
+
+    for candidate, kept in candidates:
+        if kept == 0:
+            continue  # nothing complete survived the truncation
+
+        try:
+            data = _loads(candidate)
+        except json.JSONDecodeError:
+            continue
+
+        if not isinstance(data, dict):
+            continue
+
+        if not closed and required_key is not None:
+            if required_key not in data:
+                raise JSONRepairError(
+                    f"Truncated model output lost required key '{required_key}'"
+                )
+            if data[required_key] == []:
+                # e.g. cut inside the first dimension after other members
+                raise JSONRepairError(
+                    f"Truncated model output kept no complete '{required_key}' element"
+                )
+
+        return data, True
+
+    raise JSONRepairError("Model output is structurally unrecoverable")
+
+
+def parse_llm_json(text: str, required_key: Optional[str] = "dimensions") -> Dict:
+    """
+    Parse (and if needed repair) LLM output.
+    Repaired output is marked with REPAIRED_FLAG.
+    """
+    data, repaired = repair_json(text, required_key=required_key)
+    if repaired:
+        data[REPAIRED_FLAG] = True
+    return data
+
+
+class RepairMetrics:
+    """
+    Counters for LLM JSON parsing outcomes, kept per client.
+    retry_rate = re-issued calls (structurally unrecoverable output) / requests.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.repaired = 0
+        self.retries = 0
+
+    @property
+    def retry_rate(self) -> float:
+        return round(self.retries / self.requests, 4) if self.requests else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "repaired": self.repaired,
+            "retries": self.retries,
+            "retry_rate": self.retry_rate
+        }
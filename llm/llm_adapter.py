@@ -1,5 +1,8 @@
 from typing import Optional, Dict, Any, List
 
+from llm.json_repair import REPAIRED_FLAG
+from llm.material_recognizer import default_recognizer
+
 
 # ----------------------------
 # Text normalization utilities
@@ -56,6 +59,34 @@ def infer_dimension_type(source_text: str) -> Optional[str]:
 # Adapter (LLM → Internal Schema)
 # ----------------------------
 
+def adapt_dimension(dim: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Adapt a single LLM dimension item into internal schema.
+    Returns None if the item is unsafe and must be dropped.
+
+    Shared by the batch adapter and the streaming pipeline,
+    which adapts each dimension as soon as it is generated.
+    """
+    raw_source = dim.get("source_text", "")
+    source_text = normalize_text(raw_source)
+
+    inferred_type = infer_dimension_type(source_text)
+
+    # HARD SAFETY RULE:
+    # If enum cannot be inferred → DROP dimension
+    if inferred_type is None:
+        return None
+
+    return {
+        "type": inferred_type,
+        "value": dim.get("value"),
+        "unit": dim.get("unit"),
+        "tolerance": None,          # tolerance handled later / separately
+        "source_text": source_text,
+        "confidence": 0.0           # computed later by ConfidenceScorer
+    }
+
+
 def adapt_openrouter_output(llm_output: Dict[str, Any]) -> Dict[str, Any]:
     """
     Adapt OpenRouter / open-source LLM output into internal schema.
@@ -70,24 +101,9 @@ def adapt_openrouter_output(llm_output: Dict[str, Any]) -> Dict[str, Any]:
     dimensions: List[Dict[str, Any]] = []
 
     for dim in llm_output.get("dimensions", []):
-        raw_source = dim.get("source_text", "")
-        source_text = normalize_text(raw_source)
-
-        inferred_type = infer_dimension_type(source_text)
-
-        # HARD SAFETY RULE:
-        # If enum cannot be inferred → DROP dimension
-        if inferred_type is None:
-            continue
-
-        dimensions.append({
-            "type": inferred_type,
-            "value": dim.get("value"),
-            "unit": dim.get("unit"),
-            "tolerance": None,          # tolerance handled later / separately
-            "source_text": source_text,
-            "confidence": 0.0           # computed later by ConfidenceScorer
-        })
+        adapted = adapt_dimension(dim)
+        if adapted is not None:
+            dimensions.append(adapted)
 
     material = None
     if isinstance(llm_output.get("material"), dict):
@@ -95,12 +111,15 @@ def adapt_openrouter_output(llm_output: Dict[str, Any]) -> Dict[str, Any]:
             "name": llm_output["material"].get("name"),
             "standard": llm_output["material"].get("standard")
         }
+        if isinstance(llm_output["material"].get("source_text"), str):
+            material["source_text"] = normalize_text(llm_output["material"]["source_text"])
 
     return {
         "metadata": {
             # REQUIRED fields injected later by pipeline
             "llm_backend": "openrouter",
-            "model_output_raw": True
+            "model_output_raw": True,
+            "json_repaired": bool(llm_output.get(REPAIRED_FLAG, False))
         },
         "specifications": {
             "dimensions": dimensions,
@@ -108,3 +127,44 @@ def adapt_openrouter_output(llm_output: Dict[str, Any]) -> Dict[str, Any]:
             "notes": llm_output.get("manufacturing_notes", [])
         }
     }
+
+
+# ----------------------------
+# Material fast path (catalog, no LLM)
+# ----------------------------
+
+def material_from_ocr(ocr_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Deterministically recognize the material in preprocessed OCR text.
+    Returns an internal-schema material, or None if no catalog match.
+    """
+    match = default_recognizer().recognize(ocr_text)
+    if match is None:
+        return None
+
+    return {
+        "name": match["name"],
+        "standard": match["standard"],
+        "source_text": match["source_text"],
+        "confidence": 0.0           # computed later by ConfidenceScorer
+    }
+
+
+def canonicalize_material(material: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Map an LLM-provided material onto its catalog entry when possible.
+    Unknown materials are passed through unchanged. `source_text` is
+    only ever the LLM's own, never derived from name / standard.
+    """
+    if not material:
+        return material
+
+    recognizer = default_recognizer()
+    for field in ("source_text", "standard", "name"):
+        match = recognizer.canonicalize(material.get(field) or "")
+        if match:
+            material["name"] = match["name"]
+            material["standard"] = match["standard"]
+            break
+
+    return material
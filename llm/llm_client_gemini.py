@@ -2,6 +2,11 @@ import os
 import json
 import google.generativeai as genai
 
+from llm.json_repair import parse_llm_json, JSONRepairError, RepairMetrics, REPAIRED_FLAG
+
+
+MAX_ATTEMPTS = 3
+
 
 class GeminiClient:
     def __init__(self, model: str = "gemini-2.0-flash"):
@@ -11,6 +16,7 @@ class GeminiClient:
 
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model)
+        self.metrics = RepairMetrics()
 
     def extract(self, system_prompt: str, user_prompt: str, schema: dict) -> dict:
         """
@@ -29,19 +35,31 @@ User input:
 {user_prompt}
 """
 
-        response = self.model.generate_content(
-            full_prompt,
-            generation_config={
-                "temperature": 0,
-                "response_mime_type": "application/json"
-            }
-        )
-
-        text = response.text.strip()
+        self.metrics.requests += 1
 
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            raise RuntimeError(
-                f"Gemini returned invalid JSON:\n{text}"
+        for attempt in range(MAX_ATTEMPTS):
+            response = self.model.generate_content(
+                full_prompt,
+                generation_config={
+                    "temperature": 0,
+                    "response_mime_type": "application/json"
+                }
             )
+
+            text = response.text.strip()
+
+            try:
+                data = parse_llm_json(text)
+            except JSONRepairError:
+                # only structurally unrecoverable output is re-issued
+                if attempt + 1 < MAX_ATTEMPTS:
+                    self.metrics.retries += 1
+                continue
+
+            if data.get(REPAIRED_FLAG):
+                self.metrics.repaired += 1
+            return data
+
+        raise RuntimeError(
+            f"Gemini returned invalid JSON:\n{text}"
+        )
@@ -3,7 +3,13 @@ import json
 import requests
 import time
 import random
-import re
+from typing import Callable, Dict, Iterator, Optional
+
+from llm.stream_parser import IncrementalDimensionParser
+from llm.json_repair import parse_llm_json, JSONRepairError, RepairMetrics, REPAIRED_FLAG
+
+
+MAX_ATTEMPTS = 3
 
 
 class OpenRouterClient:
@@ -17,32 +23,30 @@ class OpenRouterClient:
 
         self.model = model
         self.endpoint = "https://openrouter.ai/api/v1/chat/completions"
+        self.metrics = RepairMetrics()
 
-    def _extract_json(self, text: str) -> dict:
+    def _extract_json(self, text: str, required_key: Optional[str] = "dimensions") -> dict:
         """
         Robust JSON extraction:
-        - Removes ```json fences
-        - Removes ``` fences
-        - Fails hard if JSON invalid
+        - Removes ```json fences / surrounding prose
+        - Repairs trailing commas and truncated output
+        - Raises JSONRepairError only if structurally unrecoverable
         """
-        text = text.strip()
-
-        # Remove markdown code fences
-        if text.startswith("```"):
-            text = re.sub(r"^```(json)?", "", text, flags=re.IGNORECASE).strip()
-            text = re.sub(r"```$", "", text).strip()
+        data = parse_llm_json(text, required_key=required_key)
+        if data.get(REPAIRED_FLAG):
+            self.metrics.repaired += 1
+        return data
 
-        return json.loads(text)
-
-    def extract(self, system_prompt: str, user_prompt: str) -> dict:
-        headers = {
+    def _headers(self) -> dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
             "HTTP-Referer": "http://localhost",
             "X-Title": "blueprint-ocr-demo"
         }
 
-        payload = {
+    def _payload(self, system_prompt: str, user_prompt: str) -> dict:
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": system_prompt},
@@ -51,7 +55,25 @@ class OpenRouterClient:
             "temperature": 0
         }
 
-        for attempt in range(3):
+    def extract(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        required_key: Optional[str] = "dimensions",
+        max_attempts: int = MAX_ATTEMPTS
+    ) -> dict:
+        """
+        `required_key` must survive JSON repair of a truncated reply;
+        packed prompts pass None since their top level is keyed by document.
+        `max_attempts` bounds requests for rate limits and unrecoverable
+        JSON; packed extraction passes 1 and retries per round instead.
+        """
+        headers = self._headers()
+        payload = self._payload(system_prompt, user_prompt)
+        self.metrics.requests += 1
+        raw_text = None
+
+        for attempt in range(max_attempts):
             resp = requests.post(
                 self.endpoint,
                 headers=headers,
@@ -60,6 +82,8 @@ class OpenRouterClient:
             )
 
             if resp.status_code in (429, 502, 503):
+                if attempt + 1 >= max_attempts:
+                    break
                 sleep = (2 ** attempt) + random.uniform(0, 1)
                 print(f"OpenRouter retry in {sleep:.1f}s...")
                 time.sleep(sleep)
@@ -74,9 +98,105 @@ class OpenRouterClient:
 
             raw_text = resp.json()["choices"][0]["message"]["content"]
 
+            try:
+                return self._extract_json(raw_text, required_key=required_key)
+            except JSONRepairError:
+                # only structurally unrecoverable output is re-issued
+                if attempt + 1 < max_attempts:
+                    self.metrics.retries += 1
+                    print("OpenRouter returned unrecoverable JSON, retrying...")
+
+        if raw_text is not None:
+            raise RuntimeError(
+                f"Model returned non-JSON output:\n{raw_text}"
+            )
+
+        raise RuntimeError("OpenRouter request failed after retries.")
+
+    def _iter_sse_content(self, resp) -> Iterator[str]:
+        """
+        Yield content deltas from an OpenAI-compatible SSE stream.
+        Comment lines (": OPENROUTER PROCESSING") are keep-alives.
+        """
+        for line in resp.iter_lines(decode_unicode=True):
+            if not line or line.startswith(":"):
+                continue
+            if not line.startswith("data:"):
+                continue
+
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                return
+
+            event = json.loads(data)
+            if "error" in event:
+                raise RuntimeError(f"OpenRouter stream error: {event['error']}")
+
+            choices = event.get("choices") or []
+            if not choices:
+                continue
+
+            delta = choices[0].get("delta", {}).get("content")
+            if delta:
+                yield delta
+
+    def extract_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        on_dimension: Callable[[Dict], None]
+    ) -> dict:
+        """
+        Streaming variant of `extract` (SSE, stream: true).
+
+        `on_dimension` is called with each raw `dimensions[]` item as soon
+        as it is closed in the stream, so scoring and grounding overlap
+        with generation. Returns the full parsed JSON at the end.
+        Retries only apply before the stream starts.
+        """
+        headers = self._headers()
+        payload = self._payload(system_prompt, user_prompt)
+        payload["stream"] = True
+        self.metrics.requests += 1
+
+        for attempt in range(MAX_ATTEMPTS):
+            resp = requests.post(
+                self.endpoint,
+                headers=headers,
+                json=payload,
+                timeout=60,
+                stream=True
+            )
+
+            if resp.status_code in (429, 502, 503):
+                resp.close()
+                sleep = (2 ** attempt) + random.uniform(0, 1)
+                print(f"OpenRouter retry in {sleep:.1f}s...")
+                time.sleep(sleep)
+                continue
+
+            if resp.status_code == 404:
+                raise RuntimeError(
+                    f"OpenRouter 404. Check model availability.\n{resp.text}"
+                )
+
+            resp.raise_for_status()
+
+            parser = IncrementalDimensionParser()
+            chunks = []
+
+            with resp:
+                for delta in self._iter_sse_content(resp):
+                    chunks.append(delta)
+                    for dim in parser.feed(delta):
+                        on_dimension(dim)
+
+            raw_text = "".join(chunks)
+
             try:
                 return self._extract_json(raw_text)
-            except Exception:
+            except JSONRepairError:
+                # dimensions were already delivered; a re-issue would duplicate them
                 raise RuntimeError(
                     f"Model returned non-JSON output:\n{raw_text}"
                 )
@@ -0,0 +1,263 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+
+# ----------------------------
+# Bundled material catalog
+# ----------------------------
+#
+# One entry per material grade. `standard` is the canonical designation
+# returned to callers; `aliases` are equivalent designations across
+# AISI / ASTM / UNS / EN / JIS / ISO. Bare numbers ("304", "6061") are
+# deliberately excluded: on a drawing they are far more likely dimensions.
+#
+# OCR-noisy spellings (SS3O4, AISI 3l6, 1.43O1) are not listed one by one;
+# the recognizer folds O/0 and I/l/1 confusions while walking the trie.
+
+MATERIAL_CATALOG: List[Dict] = [
+    # Stainless steels
+    {"name": "Stainless Steel", "standard": "AISI 303",
+     "aliases": ["AISI 303", "SS303", "SS 303", "SUS303", "UNS S30300", "1.4305", "X8CrNiS18-9"]},
+    {"name": "Stainless Steel", "standard": "AISI 304",
+     "aliases": ["AISI 304", "SS304", "SS 304", "SUS304", "UNS S30400", "1.4301", "X5CrNi18-10",
+                 "ASTM A240 304", "ASTM A276 304"]},
+    {"name": "Stainless Steel", "standard": "AISI 304L",
+     "aliases": ["AISI 304L", "SS304L", "SS 304L", "SUS304L", "UNS S30403", "1.4307", "X2CrNi18-9"]},
+    {"name": "Stainless Steel", "standard": "AISI 316",
+     "aliases": ["AISI 316", "SS316", "SS 316", "SUS316", "UNS S31600", "1.4401", "X5CrNiMo17-12-2",
+                 "ASTM A240 316", "ASTM A276 316"]},
+    {"name": "Stainless Steel", "standard": "AISI 316L",
+     "aliases": ["AISI 316L", "SS316L", "SS 316L", "SUS316L", "UNS S31603", "1.4404", "X2CrNiMo17-12-2"]},
+    {"name": "Stainless Steel", "standard": "AISI 410",
+     "aliases": ["AISI 410", "SS410", "SS 410", "SUS410", "UNS S41000", "1.4006", "X12Cr13"]},
+    {"name": "Stainless Steel", "standard": "AISI 420",
+     "aliases": ["AISI 420", "SS420", "SS 420", "SUS420J2", "UNS S42000", "1.4021", "X20Cr13"]},
+    {"name": "Stainless Steel", "standard": "AISI 430",
+     "aliases": ["AISI 430", "SS430", "SS 430", "SUS430", "UNS S43000", "1.4016", "X6Cr17"]},
+    {"name": "Stainless Steel", "standard": "17-4PH",
+     "aliases": ["17-4PH", "17-4 PH", "AISI 630", "SUS630", "UNS S17400", "1.4542", "X5CrNiCuNb16-4"]},
+
+    # Carbon and alloy steels
+    {"name": "Carbon Steel", "standard": "ASTM A36",
+     "aliases": ["ASTM A36", "A36 STEEL"]},
+    {"name": "Carbon Steel", "standard": "AISI 1018",
+     "aliases": ["AISI 1018", "SAE 1018", "UNS G10180", "C15E"]},
+    {"name": "Carbon Steel", "standard": "AISI 1045",
+     "aliases": ["AISI 1045", "SAE 1045", "UNS G10450", "1.0503", "C45", "C45E", "S45C"]},
+    {"name": "Carbon Steel", "standard": "EN S235JR",
+     "aliases": ["S235JR", "S235", "1.0038", "ST37-2"]},
+    {"name": "Carbon Steel", "standard": "EN S355JR",
+     "aliases": ["S355JR", "S355J2", "S355", "1.0045", "ST52-3"]},
+    {"name": "Carbon Steel", "standard": "JIS SS400",
+     "aliases": ["SS400", "JIS G3101 SS400"]},
+    {"name": "Carbon Steel", "standard": "JIS SPCC",
+     "aliases": ["SPCC", "JIS G3141 SPCC", "DC01", "1.0330"]},
+    {"name": "Alloy Steel", "standard": "AISI 4140",
+     "aliases": ["AISI 4140", "SAE 4140", "UNS G41400", "42CrMo4", "1.7225", "SCM440"]},
+
+    # Aluminium alloys
+    {"name": "Aluminium Alloy", "standard": "AA 2024",
+     "aliases": ["AL2024", "AL 2024", "2024-T3", "2024-T351", "EN AW-2024", "AlCu4Mg1", "A2024"]},
+    {"name": "Aluminium Alloy", "standard": "AA 5052",
+     "aliases": ["AL5052", "AL 5052", "5052-H32", "EN AW-5052", "AlMg2.5", "A5052"]},
+    {"name": "Aluminium Alloy", "standard": "AA 6061",
+     "aliases": ["AL6061", "AL 6061", "6061-T6", "6061-T651", "EN AW-6061", "AlMg1SiCu", "A6061",
+                 "ASTM B221 6061"]},
+    {"name": "Aluminium Alloy", "standard": "AA 6082",
+     "aliases": ["AL6082", "AL 6082", "6082-T6", "EN AW-6082", "AlSi1MgMn"]},
+    {"name": "Aluminium Alloy", "standard": "AA 7075",
+     "aliases": ["AL7075", "AL 7075", "7075-T6", "7075-T651", "EN AW-7075", "AlZn5.5MgCu", "A7075"]},
+
+    # Copper alloys
+    {"name": "Brass", "standard": "UNS C36000",
+     "aliases": ["C36000", "C360", "CuZn39Pb3", "CW614N", "C3604"]},
+    {"name": "Copper", "standard": "UNS C11000",
+     "aliases": ["C11000", "Cu-ETP", "CW004A", "C1100"]},
+
+    # Titanium
+    {"name": "Titanium Alloy", "standard": "Ti-6Al-4V",
+     "aliases": ["Ti-6Al-4V", "Ti6Al4V", "TI GRADE 5", "TI GR5", "ASTM B348 GR5", "UNS R56400", "3.7165"]},
+    {"name": "Titanium", "standard": "CP Ti Grade 2",
+     "aliases": ["TI GRADE 2", "TI GR2", "ASTM B348 GR2", "UNS R50400", "3.7035"]},
+
+    # Engineering plastics (ISO 1043 abbreviations)
+    {"name": "Acetal", "standard": "POM",
+     "aliases": ["POM", "POM-C", "POM-H", "DELRIN"]},
+    {"name": "Polyamide", "standard": "PA6",
+     "aliases": ["PA6", "PA 6", "NYLON 6"]},
+    {"name": "Polyamide", "standard": "PA66",
+     "aliases": ["PA66", "PA 66", "PA6.6", "NYLON 66"]},
+    {"name": "PTFE", "standard": "PTFE",
+     "aliases": ["PTFE", "TEFLON"]},
+    {"name": "PEEK", "standard": "PEEK",
+     "aliases": ["PEEK"]},
+]
+
+
+# Separators inside a designation: "SS 304" == "SS-304" == "SS304".
+# They are only skipped where an alias has one, or between a multi-letter
+# prefix and a grade number, so a match never runs into the next token
+# ("SS304 L 50" is SS304 followed by a length, not SS304L) and callouts
+# such as "CHAMFER C 45" or "DETAIL A 2024" are not read as C45 / A2024.
+SEPARATORS = frozenset(" -_")
+HYPHENS = frozenset("-_")
+
+# "MAT:", "MATERIAL", "MATL." title block labels; a designation on such
+# a line wins over one found anywhere else on the drawing
+MATERIAL_LABEL = re.compile(r"\bMAT(?:ERIAL|L)?\b", re.IGNORECASE)
+
+# Common OCR confusions, tried only when the literal character
+# has no continuation in the trie
+OCR_FOLDS = {
+    "O": "0",
+    "0": "O",
+    "I": "1",
+    "L": "1",
+}
+
+
+class MaterialRecognizer:
+    """
+    Deterministic material recognizer backed by a prefix trie
+    compiled from MATERIAL_CATALOG.
+
+    Scans (preprocessed) OCR text in a single left-to-right pass,
+    walking the trie from each token start and keeping the longest
+    designation that ends on a token boundary.
+    """
+
+    # multi-character keys never collide with single-character edges
+    _END = "_end"
+    _SEP = "_sep"
+
+    def __init__(self, catalog: Optional[List[Dict]] = None):
+        self.catalog = catalog if catalog is not None else MATERIAL_CATALOG
+        self.trie: Dict = {}
+
+        for idx, entry in enumerate(self.catalog):
+            for alias in entry["aliases"]:
+                node = self.trie
+                for ch in alias.upper():
+                    if ch in SEPARATORS:
+                        # a space accepts any separator, a hyphen only hyphens
+                        if node.get(self._SEP) != "any":
+                            node[self._SEP] = "any" if ch == " " else "hyphen"
+                        continue
+                    node = node.setdefault(ch, {})
+                node[self._END] = idx
+
+    def find_all(self, text: str) -> List[Dict]:
+        """
+        Return every catalog material found in `text`, in order.
+        """
+        if not text:
+            return []
+
+        upper = text.upper()
+        n = len(upper)
+        matches = []
+        i = 0
+
+        while i < n:
+            if not upper[i].isalnum() or (i > 0 and upper[i - 1].isalnum()):
+                i += 1
+                continue
+
+            match = self._longest_match(upper, i)
+            if match is None:
+                i += 1
+                continue
+
+            end, idx, noisy = match
+            entry = self.catalog[idx]
+            matches.append({
+                "name": entry["name"],
+                "standard": entry["standard"],
+                "source_text": text[i:end],
+                "start": i,
+                "end": end,
+                "noisy": noisy,
+            })
+            i = end
+
+        return matches
+
+    def _longest_match(self, upper: str, start: int):
+        n = len(upper)
+        node = self.trie
+        noisy = False
+        best = None
+        j = start
+
+        while j < n:
+            ch = upper[j]
+
+            if ch in SEPARATORS:
+                # separators only inside a designation, never trailing
+                k = j
+                while k < n and upper[k] in SEPARATORS:
+                    k += 1
+
+                if k >= n or not self._separator_allowed(node, upper, start, j, k):
+                    break
+
+                j = k
+                continue
+
+            if ch in node:
+                node = node[ch]
+            elif OCR_FOLDS.get(ch) in node:
+                node = node[OCR_FOLDS[ch]]
+                noisy = True
+            else:
+                break
+
+            j += 1
+
+            if self._END in node and (j >= n or not upper[j].isalnum()):
+                best = (j, node[self._END], noisy)
+
+        return best
+
+    def _separator_allowed(self, node: Dict, upper: str, start: int, j: int, k: int) -> bool:
+        kind = node.get(self._SEP)
+        if kind == "any":
+            return True
+        if kind == "hyphen" and set(upper[j:k]) <= HYPHENS:
+            return True
+        # "SUS 304", "AISI-316": multi-letter prefix split from its grade
+        # number; a single letter ("C 45", "A 2024") is a callout
+        return (
+            j - start >= 2
+            and upper[j - 2].isalpha()
+            and upper[j - 1].isalpha()
+            and upper[k].isdigit()
+        )
+
+    def recognize(self, text: str) -> Optional[Dict]:
+        """
+        Best single material in `text`: matches on a MAT / MATERIAL line
+        first, then clean before OCR-noisy, then the earliest.
+        """
+        matches = self.find_all(text)
+        if not matches:
+            return None
+
+        def rank(match):
+            line_start = text.rfind("\n", 0, match["start"]) + 1
+            labelled = MATERIAL_LABEL.search(text, line_start, match["start"]) is not None
+            return (not labelled, match["noisy"], match["start"])
+
+        return min(matches, key=rank)
+
+    def canonicalize(self, designation: str) -> Optional[Dict]:
+        """
+        Canonical catalog entry for a material string (e.g. LLM output).
+        """
+        return self.recognize(designation or "")
+
+
+@lru_cache(maxsize=1)
+def default_recognizer() -> MaterialRecognizer:
+    return MaterialRecognizer()
@@ -0,0 +1,149 @@
+import time
+import random
+from typing import Dict, List, Tuple
+
+from llm.json_repair import REPAIRED_FLAG
+
+
+# Rough token estimate; good enough to stay under a packing budget
+CHARS_PER_TOKEN = 4
+
+DEFAULT_TOKEN_BUDGET = 3000
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def format_document(doc_id: str, text: str) -> str:
+    return f'<document id="{doc_id}">\n{text}\n</document>'
+
+
+def pack_documents(documents: Dict[str, str], token_budget: int = DEFAULT_TOKEN_BUDGET) -> List[List[str]]:
+    """
+    Greedily group document ids (in order) so that the tagged documents
+    of each pack fit in `token_budget`. A document larger than the budget
+    on its own still gets a pack of its own.
+    """
+    packs: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+
+    for doc_id, text in documents.items():
+        cost = estimate_tokens(format_document(doc_id, text))
+
+        if current and used + cost > token_budget:
+            packs.append(current)
+            current, used = [], 0
+
+        current.append(doc_id)
+        used += cost
+
+    if current:
+        packs.append(current)
+
+    return packs
+
+
+def build_packed_prompt(template: str, documents: Dict[str, str], doc_ids: List[str]) -> str:
+    body = "\n\n".join(format_document(doc_id, documents[doc_id]) for doc_id in doc_ids)
+    return template.replace("{{DOCUMENTS}}", body)
+
+
+def _well_formed(part) -> bool:
+    """
+    True when a per-document output has the shape the adapter expects:
+    an object whose `dimensions` is a list of objects.
+    """
+    if not isinstance(part, dict):
+        return False
+
+    dimensions = part.get("dimensions")
+    if not isinstance(dimensions, list) or not all(isinstance(d, dict) for d in dimensions):
+        return False
+
+    return isinstance(part.get("manufacturing_notes", []), list)
+
+
+def split_packed_output(llm_output: Dict, doc_ids: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+    """
+    Split a keyed packed response into per-document LLM outputs.
+    Returns (results, missing_doc_ids). A document is missing when its key
+    is absent (e.g. dropped by JSON repair after truncation) or its output
+    is malformed, so that it is re-issued rather than failing later.
+    """
+    keyed = llm_output
+    if not any(doc_id in llm_output for doc_id in doc_ids) and isinstance(llm_output.get("documents"), dict):
+        keyed = llm_output["documents"]
+
+    repaired = bool(llm_output.get(REPAIRED_FLAG))
+    results: Dict[str, Dict] = {}
+    missing: List[str] = []
+
+    for doc_id in doc_ids:
+        part = keyed.get(doc_id)
+        if not _well_formed(part):
+            missing.append(doc_id)
+            continue
+
+        if repaired:
+            part = {**part, REPAIRED_FLAG: True}
+        results[doc_id] = part
+
+    return results, missing
+
+
+def extract_packed(
+    client,
+    system_prompt: str,
+    template: str,
+    documents: Dict[str, str],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    max_rounds: int = 3
+) -> Tuple[Dict[str, Dict], List[str]]:
+    """
+    Extract many small documents with as few LLM requests as possible.
+
+    Each round packs the still-pending documents up to `token_budget`
+    and issues one request per pack. Only documents missing from a
+    partial or failed response are re-issued in the next round.
+    Rounds are the only retry budget: the client makes a single attempt
+    per pack, and a failed request (e.g. 429) backs off before the next
+    round. Returns (raw LLM output per document id, ids still missing).
+    """
+    results: Dict[str, Dict] = {}
+    pending = list(documents)
+
+    for round_no in range(max_rounds):
+        if not pending:
+            break
+
+        missing: List[str] = []
+        pending_docs = {doc_id: documents[doc_id] for doc_id in pending}
+        request_failed = False
+
+        for pack in pack_documents(pending_docs, token_budget):
+            try:
+                raw = client.extract(
+                    system_prompt=system_prompt,
+                    user_prompt=build_packed_prompt(template, documents, pack),
+                    required_key=None,
+                    max_attempts=1
+                )
+            except RuntimeError:
+                missing.extend(pack)
+                request_failed = True
+                continue
+
+            found, lost = split_packed_output(raw, pack)
+            results.update(found)
+            missing.extend(lost)
+
+        pending = missing
+
+        if request_failed and pending and round_no + 1 < max_rounds:
+            sleep = (2 ** round_no) + random.uniform(0, 1)
+            print(f"Packed request failed, next round in {sleep:.1f}s...")
+            time.sleep(sleep)
+
+    return results, pending
@@ -0,0 +1,115 @@
+from typing import Dict, List
+
+from llm.json_repair import repair_json, JSONRepairError
+
+
+class IncrementalDimensionParser:
+    """
+    Incremental JSON scanner for streamed LLM output.
+
+    Emits every element of the top-level `dimensions` array as soon as
+    its closing brace arrives, without waiting for the full document.
+    Prose or markdown fences before the first `{` are ignored; each
+    element gets the same repair as a complete reply (llm.json_repair).
+    """
+
+    def __init__(self, array_key: str = "dimensions"):
+        self.array_key = array_key
+
+        self._stack: List[str] = []
+        self._started = False
+        self._in_string = False
+        self._escape = False
+
+        # key tracking at the top-level object only
+        self._key_chars: List[str] = []
+        self._last_string = None
+        self._current_key = None
+
+        self._in_array = False
+        self._element: List[str] = []
+        self._capturing = False
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Consume the next piece of streamed text.
+        Returns the dimension dicts completed within this chunk.
+        """
+        completed: List[Dict] = []
+
+        for ch in chunk:
+            if self._capturing:
+                self._element.append(ch)
+
+            if self._in_string:
+                self._consume_string_char(ch)
+                continue
+
+            if not self._started:
+                if ch != "{":
+                    continue
+                self._started = True
+
+            depth = len(self._stack)
+
+            if ch == '"':
+                self._in_string = True
+                if depth == 1:
+                    self._key_chars = []
+            elif ch == ":" and depth == 1:
+                self._current_key = self._last_string
+            elif ch == "," and depth == 1:
+                self._current_key = None
+            elif ch in "{[":
+                self._stack.append(ch)
+                if ch == "[" and depth == 1 and self._current_key == self.array_key:
+                    self._in_array = True
+                elif ch == "{" and self._in_array and depth == 2:
+                    self._capturing = True
+                    self._element = [ch]
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                depth = len(self._stack)
+
+                if self._capturing and depth == 2:
+                    self._capturing = False
+                    item = self._decode_element()
+                    if item is not None:
+                        completed.append(item)
+                elif self._in_array and depth == 1:
+                    self._in_array = False
+
+        return completed
+
+    def _consume_string_char(self, ch: str):
+        if self._escape:
+            self._escape = False
+            if len(self._stack) == 1:
+                self._key_chars.append(ch)
+            return
+
+        if ch == "\\":
+            self._escape = True
+            return
+
+        if ch == '"':
+            self._in_string = False
+            if len(self._stack) == 1:
+                self._last_string = "".join(self._key_chars)
+            return
+
+        if len(self._stack) == 1:
+            self._key_chars.append(ch)
+
+    def _decode_element(self):
+        # same repair as the final document, so a trailing comma inside
+        # one dimension does not drop it from the stream only
+        try:
+            item, _ = repair_json("".join(self._element), required_key=None)
+        except JSONRepairError:
+            return None
+        finally:
+            self._element = []
+
+        return item
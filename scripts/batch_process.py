@@ -0,0 +1,94 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from llm.llm_client_openrouter import OpenRouterClient
+from scripts.run_local_pipeline import run_pipeline, run_packed_pipeline
+from storage.result_store import ResultStore
+
+
+def process_directory(
+    input_dir: str,
+    stream: bool = False,
+    pattern: str = "*.txt",
+    pack_tokens: int = None
+):
+    """
+    Run the local pipeline over every OCR text file in `input_dir`.
+    With `pack_tokens`, small documents share LLM requests (prompt packing).
+    Returns (successful outputs, {file_name: error}).
+    """
+    client = OpenRouterClient()
+    paths = sorted(Path(input_dir).glob(pattern))
+
+    if pack_tokens:
+        return run_packed_pipeline(
+            [str(path) for path in paths],
+            token_budget=pack_tokens,
+            client=client
+        )
+
+    outputs = []
+    errors = {}
+
+    for path in paths:
+        try:
+            outputs.append(run_pipeline(str(path), stream=stream, client=client))
+        except Exception as e:
+            errors[path.name] = str(e)
+
+    print(f"LLM JSON metrics: {client.metrics.as_dict()}", file=sys.stderr)
+    return outputs, errors
+
+
+def main(
+    input_dir: str,
+    stream: bool = False,
+    store_path: str = None,
+    out_dir: str = None,
+    pack_tokens: int = None
+):
+    outputs, errors = process_directory(input_dir, stream=stream, pack_tokens=pack_tokens)
+
+    if out_dir:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        for output in outputs:
+            name = Path(output["metadata"]["file_name"]).stem + ".json"
+            Path(out_dir, name).write_text(json.dumps(output, indent=2))
+
+    # single transaction for the whole batch
+    if store_path and outputs:
+        with ResultStore(store_path) as store:
+            store.insert_documents(outputs)
+
+    for file_name, error in errors.items():
+        print(f"FAILED {file_name}: {error}", file=sys.stderr)
+
+    print(f"Processed {len(outputs)} file(s), {len(errors)} failed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        usage="python -m scripts.batch_process <input_dir> [--stream | --pack-tokens N] [--store DB] [--out-dir DIR]"
+    )
+    parser.add_argument("input_dir")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--store", default=None, help="SQLite result store to insert into")
+    parser.add_argument("--out-dir", default=None, help="Write one JSON file per document")
+    parser.add_argument(
+        "--pack-tokens", type=int, default=None,
+        help="Pack several documents per LLM request up to this many prompt tokens"
+    )
+    args = parser.parse_args()
+
+    if args.stream and args.pack_tokens:
+        parser.error("--stream and --pack-tokens are mutually exclusive")
+
+    main(
+        args.input_dir,
+        stream=args.stream,
+        store_path=args.store,
+        out_dir=args.out_dir,
+        pack_tokens=args.pack_tokens
+    )
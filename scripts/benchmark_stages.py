@@ -0,0 +1,369 @@
+import sys
+import json
+import time
+import cProfile
+import argparse
+import platform
+import statistics
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ocr.preprocess import OCRPreprocessor
+from llm.llm_adapter import adapt_openrouter_output
+from llm.confidence_scoring import ConfidenceScorer
+from llm.material_recognizer import MaterialRecognizer
+from llm.grounding import GroundingEngine
+from llm.postprocessor import PostProcessor
+from schemas.schema_validator import validate_against_schema
+
+
+DEFAULT_BASELINE = "data/benchmarks/baseline.json"
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_REPEAT = 7
+
+
+# ----------------------------
+# Scaled fixtures
+# ----------------------------
+
+# Raw OCR line templates, deliberately noisy (same artifacts as sample_ocr.txt)
+OCR_LINE_TEMPLATES = [
+    "Ø {n}O mm ± O.2",
+    "LENGTH {n}0 mm +/- 0.5",
+    "MAT: SS3O4",
+    "A - {n}",
+    "R {n}mm",
+    "WIDTH  {n}5   mm",
+    "NOTE: DEBURR ALL EDGES",
+    "HEIGHT {n}.5 mm H7",
+]
+
+DIMENSION_TEMPLATES = [
+    ("DIAMETER {n}0mm +/- 0.2", "diameter", "mm"),
+    ("LENGTH {n}0mm +/- 0.5", "length", "millimeter"),
+    ("WIDTH {n}5mm", "width", "mm"),
+    ("HEIGHT {n}.5mm H7", "height", "cm"),
+    ("radius {n}mm", "radius", "inch"),
+]
+
+
+def make_ocr_text(n_lines: int) -> str:
+    lines = []
+    for i in range(n_lines):
+        template = OCR_LINE_TEMPLATES[i % len(OCR_LINE_TEMPLATES)]
+        lines.append(template.format(n=(i % 97) + 1))
+    return "\n".join(lines)
+
+
+def make_dimensions(n_dims: int) -> List[Dict]:
+    dims = []
+    for i in range(n_dims):
+        source, dim_type, unit = DIMENSION_TEMPLATES[i % len(DIMENSION_TEMPLATES)]
+        dims.append({
+            "type": dim_type,
+            "value": float((i % 97) + 1),
+            "unit": unit,
+            "tolerance": None,
+            "source_text": source.format(n=(i % 97) + 1),
+            "confidence": 0.8
+        })
+    return dims
+
+
+def make_llm_output(n_dims: int) -> Dict:
+    return {
+        "dimensions": [
+            {
+                "value": dim["value"],
+                "unit": dim["unit"],
+                "source_text": dim["source_text"].replace("DIAMETER", "Ø"),
+            }
+            for dim in make_dimensions(n_dims)
+        ],
+        "material": {"name": "Stainless Steel", "standard": "SS304"},
+        "manufacturing_notes": [{"text": "DEBURR ALL EDGES"}]
+    }
+
+
+def make_document(n_dims: int) -> Dict:
+    dims = make_dimensions(n_dims)
+    for dim in dims:
+        dim["unit"] = PostProcessor().normalize_unit(dim["unit"])
+    return {
+        "metadata": {
+            "file_name": "bench.txt",
+            "processed_at": "2025-01-01T00:00:00Z"
+        },
+        "specifications": {
+            "dimensions": dims,
+            "material": None,
+            "notes": []
+        }
+    }
+
+
+# ----------------------------
+# Benchmark registry
+# ----------------------------
+
+class Benchmark:
+    """
+    A single timed stage call.
+
+    `setup` builds fresh input outside the timed region (several stages
+    mutate their input in place), `run` is the measured call.
+    """
+
+    def __init__(self, name: str, setup: Callable[[], tuple], run: Callable, max_iterations: int = 1000):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.max_iterations = max_iterations
+
+
+def build_benchmarks() -> List[Benchmark]:
+    schema = json.loads(Path("schemas/output_schema_v1.json").read_text())
+
+    preprocessor = OCRPreprocessor()
+    scorer = ConfidenceScorer()
+    engine = GroundingEngine()
+    post = PostProcessor()
+    recognizer = MaterialRecognizer()
+
+    benchmarks = []
+
+    for n_lines in (10, 1_000, 100_000):
+        text = make_ocr_text(n_lines)
+        benchmarks.append(Benchmark(
+            f"preprocess[{n_lines}_lines]",
+            lambda text=text: (text,),
+            preprocessor.preprocess,
+        ))
+
+        clean = preprocessor.preprocess(text)
+        benchmarks.append(Benchmark(
+            f"material_find_all[{n_lines}_lines]",
+            lambda clean=clean: (clean,),
+            recognizer.find_all,
+        ))
+
+    # Grounding is O(dimensions x lines) difflib calls, so the OCR side is
+    # held at a realistic drawing size instead of the 100k line fixture.
+    grounding_ocr = preprocessor.preprocess(make_ocr_text(100))
+    scoring_ocr = preprocessor.preprocess(make_ocr_text(1_000))
+
+    for n_dims in (10, 1_000):
+        benchmarks.append(Benchmark(
+            f"ground_dimensions[{n_dims}_dims]",
+            lambda n=n_dims: (make_dimensions(n), grounding_ocr),
+            engine.ground_dimensions,
+            max_iterations=20,
+        ))
+
+        benchmarks.append(Benchmark(
+            f"score_dimension[{n_dims}_dims]",
+            lambda n=n_dims: (make_dimensions(n), scoring_ocr),
+            lambda dims, ocr: [scorer.score_dimension(d, ocr) for d in dims],
+        ))
+
+        benchmarks.append(Benchmark(
+            f"postprocess[{n_dims}_dims]",
+            lambda n=n_dims: (make_document(n),),
+            post.process,
+        ))
+
+        llm_output = make_llm_output(n_dims)
+        benchmarks.append(Benchmark(
+            f"adapt_openrouter_output[{n_dims}_dims]",
+            lambda out=llm_output: (out,),
+            adapt_openrouter_output,
+        ))
+
+        document = make_document(n_dims)
+        benchmarks.append(Benchmark(
+            f"validate_against_schema[{n_dims}_dims]",
+            lambda doc=document: (doc, schema),
+            validate_against_schema,
+        ))
+
+    return benchmarks
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+
+def time_benchmark(
+    bench: Benchmark,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = 0.2,
+    profile_dir: Optional[Path] = None
+) -> float:
+    """
+    Return the median over `repeat` runs of seconds per call.
+    Each repeat runs until `min_time` has elapsed (or `max_iterations`).
+    The median keeps one noisy repeat from moving the result either way.
+    """
+    samples = []
+
+    for _ in range(repeat):
+        elapsed = 0.0
+        iterations = 0
+
+        while elapsed < min_time and iterations < bench.max_iterations:
+            args = bench.setup()
+            start = time.perf_counter()
+            bench.run(*args)
+            elapsed += time.perf_counter() - start
+            iterations += 1
+
+        samples.append(elapsed / iterations)
+
+    if profile_dir is not None:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        args = bench.setup()
+        profiler = cProfile.Profile()
+        profiler.runcall(bench.run, *args)
+        profiler.dump_stats(str(profile_dir / f"{safe_name(bench.name)}.prof"))
+
+    return statistics.median(samples)
+
+
+def safe_name(name: str) -> str:
+    return name.replace("[", "_").replace("]", "")
+
+
+def run_benchmarks(
+    name_filter: Optional[str] = None,
+    repeat: int = DEFAULT_REPEAT,
+    profile_dir: Optional[Path] = None
+) -> Dict[str, float]:
+    results = {}
+
+    for bench in build_benchmarks():
+        if name_filter and name_filter not in bench.name:
+            continue
+
+        seconds = time_benchmark(bench, repeat=repeat, profile_dir=profile_dir)
+        results[bench.name] = seconds
+        print(f"{bench.name:<45} {seconds * 1000:>12.3f} ms")
+
+    return results
+
+
+# ----------------------------
+# Baselines
+# ----------------------------
+
+def save_baseline(results: Dict[str, float], path: str):
+    payload = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform()
+        },
+        "benchmarks": {
+            name: {"seconds": round(seconds, 9)}
+            for name, seconds in sorted(results.items())
+        }
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    payload = json.loads(Path(path).read_text())
+    return {
+        name: entry["seconds"]
+        for name, entry in payload.get("benchmarks", {}).items()
+    }
+
+
+def compare_results(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict]:
+    """
+    Compare current timings with baseline timings.
+    A benchmark regresses when it is more than `threshold` (fraction) slower.
+    Benchmarks missing from the baseline are reported but never flagged.
+    """
+    report = []
+
+    for name, seconds in sorted(current.items()):
+        base = baseline.get(name)
+        ratio = seconds / base if base else None
+
+        report.append({
+            "name": name,
+            "seconds": seconds,
+            "baseline": base,
+            "ratio": round(ratio, 3) if ratio is not None else None,
+            "regressed": ratio is not None and ratio > 1.0 + threshold
+        })
+
+    return report
+
+
+def print_report(report: List[Dict]):
+    for row in report:
+        if row["baseline"] is None:
+            status = "NEW"
+            ratio = "-"
+        else:
+            status = "SLOWER" if row["regressed"] else "ok"
+            ratio = f"{row['ratio']:.2f}x"
+
+        print(f"{row['name']:<45} {row['seconds'] * 1000:>12.3f} ms {ratio:>8} {status}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmarks for the CPU-bound pipeline stages."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for command in ("run", "compare"):
+        p = sub.add_parser(command)
+        p.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this")
+        p.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+        p.add_argument("--baseline", default=DEFAULT_BASELINE)
+        p.add_argument("--profile-dir", default=None, help="Dump a cProfile .prof file per benchmark")
+
+    sub.choices["run"].add_argument(
+        "--save-baseline", action="store_true",
+        help="Write results to the baseline file"
+    )
+    sub.choices["compare"].add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown as a fraction (0.5 = 50%%)"
+    )
+
+    args = parser.parse_args(argv)
+    profile_dir = Path(args.profile_dir) if args.profile_dir else None
+
+    if args.command == "compare":
+        baseline = load_baseline(args.baseline)
+
+    results = run_benchmarks(args.filter, repeat=args.repeat, profile_dir=profile_dir)
+
+    if args.command == "run":
+        if args.save_baseline:
+            save_baseline(results, args.baseline)
+            print(f"Baseline written to {args.baseline}")
+        return 0
+
+    report = compare_results(results, baseline, threshold=args.threshold)
+    print()
+    print_report(report)
+
+    regressions = [row["name"] for row in report if row["regressed"]]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
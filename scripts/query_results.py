@@ -0,0 +1,70 @@
+import sys
+import json
+import time
+import sqlite3
+import argparse
+
+from storage.result_store import ResultStore
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Query the local SQLite result store."
+    )
+    parser.add_argument("--db", default="data/results.sqlite3")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    dims = sub.add_parser("dims", help="Range / filter query over dimensions")
+    dims.add_argument("--type", default=None)
+    dims.add_argument("--value-mm", type=float, default=None)
+    dims.add_argument("--tol-mm", type=float, default=0.0)
+    dims.add_argument("--min-mm", type=float, default=None)
+    dims.add_argument("--max-mm", type=float, default=None)
+    dims.add_argument("--unit", default=None)
+    dims.add_argument("--material", default=None, help="Material name or standard, e.g. SS304")
+    dims.add_argument("--text", default=None, help="Text to match in source_text")
+    dims.add_argument("--raw", action="store_true", help="Treat --text as FTS5 query syntax")
+    dims.add_argument("--limit", type=int, default=100)
+
+    search = sub.add_parser("search", help="Full-text search over source_text and notes")
+    search.add_argument("query")
+    search.add_argument("--kind", choices=["dimension", "note"], default=None)
+    search.add_argument("--raw", action="store_true", help="Treat the query as FTS5 query syntax")
+    search.add_argument("--limit", type=int, default=100)
+
+    args = parser.parse_args(argv)
+
+    with ResultStore(args.db) as store:
+        start = time.perf_counter()
+
+        try:
+            if args.command == "dims":
+                rows = store.query_dimensions(
+                    type=args.type,
+                    value_mm=args.value_mm,
+                    tolerance_mm=args.tol_mm,
+                    min_mm=args.min_mm,
+                    max_mm=args.max_mm,
+                    unit=args.unit,
+                    material=args.material,
+                    text=args.text,
+                    raw=args.raw,
+                    limit=args.limit
+                )
+            else:
+                rows = store.search(args.query, kind=args.kind, raw=args.raw, limit=args.limit)
+        except sqlite3.OperationalError as e:
+            print(f"Invalid query: {e}", file=sys.stderr)
+            return 2
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for row in rows:
+        print(json.dumps(row))
+
+    print(f"{len(rows)} row(s) in {elapsed_ms:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
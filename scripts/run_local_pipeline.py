@@ -1,14 +1,22 @@
 import sys
 import json
+import argparse
 from pathlib import Path
 
 from ocr.preprocess import OCRPreprocessor
 from llm.llm_client_openrouter import OpenRouterClient
-from llm.llm_adapter import adapt_openrouter_output
+from llm.llm_adapter import (
+    adapt_openrouter_output,
+    adapt_dimension,
+    material_from_ocr,
+    canonicalize_material,
+)
+from llm.prompt_packing import extract_packed, DEFAULT_TOKEN_BUDGET
 from llm.confidence_scoring import ConfidenceScorer
 from llm.grounding import GroundingEngine
 from llm.postprocessor import PostProcessor
 from schemas.schema_validator import validate_against_schema, SchemaValidationError
+from storage.result_store import ResultStore
 from datetime import datetime, timezone
 datetime.now(timezone.utc).isoformat()
 
@@ -18,7 +26,7 @@ def load_prompt(path: str) -> str:
 def load_schema(path: str):
     return json.loads(Path(path).read_text())
 
-def main(ocr_text_path: str):
+def run_pipeline(ocr_text_path: str, stream: bool = False, client: OpenRouterClient = None) -> dict:
     # 1. Load OCR text
     ocr_text = Path(ocr_text_path).read_text()
 
@@ -33,18 +41,80 @@ def main(ocr_text_path: str):
         "{{OCR_TEXT}}", clean_text
     )
 
+    scorer = ConfidenceScorer()
+    engine = GroundingEngine()
+
     # 4. LLM extraction (OpenRouter)
-    client = OpenRouterClient()
-    raw_llm_output = client.extract(
-        system_prompt=system_prompt,
-        user_prompt=user_prompt
+    client = client or OpenRouterClient()
+
+    if stream:
+        # 4-5 (streaming). Adapt, score and ground each dimension while
+        # the model is still generating the rest of the document.
+        ocr_lines = clean_text.splitlines()
+        streamed_dims = []
+
+        def on_dimension(raw_dim):
+            dim = adapt_dimension(raw_dim)
+            if dim is None:
+                return
+            dim["confidence"] = scorer.score_dimension(dim, clean_text)
+            engine.ground_dimension(dim, ocr_lines)
+            streamed_dims.append(dim)
+
+        raw_llm_output = client.extract_stream(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            on_dimension=on_dimension
+        )
+
+        extracted = adapt_openrouter_output({**raw_llm_output, "dimensions": []})
+        extracted["specifications"]["dimensions"] = streamed_dims
+    else:
+        raw_llm_output = client.extract(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt
+        )
+
+        # 5. Adapt to internal schema
+        extracted = adapt_openrouter_output(raw_llm_output)
+
+    print(f"LLM JSON metrics: {client.metrics.as_dict()}", file=sys.stderr)
+
+    return finalize_extraction(
+        extracted,
+        raw_llm_output,
+        clean_text,
+        file_name=Path(ocr_text_path).name,
+        dimensions_scored=stream,
+        scorer=scorer,
+        engine=engine
     )
 
-    # 5. Adapt to internal schema
-    extracted = adapt_openrouter_output(raw_llm_output)
 
-    # 5.1 Enrich metadata (PIPELINE responsibility)
-    extracted["metadata"]["file_name"] = Path(ocr_text_path).name
+def finalize_extraction(
+    extracted: dict,
+    raw_llm_output: dict,
+    clean_text: str,
+    file_name: str,
+    dimensions_scored: bool = False,
+    scorer: ConfidenceScorer = None,
+    engine: GroundingEngine = None
+) -> dict:
+    """
+    Steps 5.1-8 for one document, after its LLM output has been adapted.
+    Shared by the single-document, streaming and packed pipelines.
+    """
+    scorer = scorer or ConfidenceScorer()
+    engine = engine or GroundingEngine()
+
+    # 5.1 Material: catalog recognizer first (deterministic, no LLM),
+    #     LLM material only as fallback, canonicalized when possible
+    specs = extracted["specifications"]
+    llm_standard = (specs["material"] or {}).get("standard")
+    specs["material"] = material_from_ocr(clean_text) or canonicalize_material(specs["material"])
+
+    # 5.2 Enrich metadata (PIPELINE responsibility)
+    extracted["metadata"]["file_name"] = file_name
     extracted["metadata"]["processed_at"] = datetime.utcnow().isoformat()
 
     # 6. HARD SCHEMA VALIDATION
@@ -63,29 +133,109 @@ def main(ocr_text_path: str):
             "No valid dimensions extracted after schema validation."
         )
 
+    # 6. Material confidence (catalog-backed)
+    if specs["material"]:
+        specs["material"]["confidence"] = scorer.score_material(
+            specs["material"], clean_text, reported_standard=llm_standard
+        )
 
-    # 6. Confidence scoring
-    scorer = ConfidenceScorer()
-    for dim in extracted["specifications"]["dimensions"]:
-        dim["confidence"] = scorer.score_dimension(dim, clean_text)
+    if not dimensions_scored:
+        # 6. Confidence scoring
+        for dim in extracted["specifications"]["dimensions"]:
+            dim["confidence"] = scorer.score_dimension(dim, clean_text)
 
-    # 7. Grounding
-    grounded_dims = GroundingEngine().ground_dimensions(
-        extracted["specifications"]["dimensions"],
-        clean_text
-    )
-    extracted["specifications"]["dimensions"] = grounded_dims
+        # 7. Grounding
+        grounded_dims = engine.ground_dimensions(
+            extracted["specifications"]["dimensions"],
+            clean_text
+        )
+        extracted["specifications"]["dimensions"] = grounded_dims
 
     # 8. Post-processing
-    final = PostProcessor().process(extracted)
+    return PostProcessor().process(extracted)
+
+
+def run_packed_pipeline(
+    ocr_text_paths: list,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    client: OpenRouterClient = None
+):
+    """
+    Packed variant of `run_pipeline` for many small drawings.
+
+    Several preprocessed documents share one LLM request (up to
+    `token_budget`), the keyed response is split back per document and
+    each one goes through the usual adapt / validate / score / ground
+    steps. Returns (outputs, {file_name: error}).
+    """
+    preprocessor = OCRPreprocessor()
+
+    # short ids are echoed back more reliably than file names
+    paths = {f"DOC{i}": Path(path) for i, path in enumerate(ocr_text_paths, start=1)}
+    clean_texts = {
+        doc_id: preprocessor.preprocess(path.read_text())
+        for doc_id, path in paths.items()
+    }
+
+    system_prompt = load_prompt("prompts/system_prompt.md")
+    packed_prompt = load_prompt("prompts/packed_extraction_prompt.md")
+
+    client = client or OpenRouterClient()
+    raw_outputs, missing = extract_packed(
+        client,
+        system_prompt,
+        packed_prompt,
+        clean_texts,
+        token_budget=token_budget
+    )
+
+    print(f"LLM JSON metrics: {client.metrics.as_dict()}", file=sys.stderr)
+
+    scorer = ConfidenceScorer()
+    engine = GroundingEngine()
+    outputs = []
+    errors = {}
+
+    for doc_id, path in paths.items():
+        if doc_id in missing:
+            errors[path.name] = "Document missing or malformed in packed LLM responses after retries."
+            continue
+
+        raw_llm_output = raw_outputs[doc_id]
+        try:
+            outputs.append(finalize_extraction(
+                adapt_openrouter_output(raw_llm_output),
+                raw_llm_output,
+                clean_texts[doc_id],
+                file_name=path.name,
+                scorer=scorer,
+                engine=engine
+            ))
+        except Exception as e:
+            # one badly shaped document must not lose the rest of the batch
+            errors[path.name] = str(e)
+
+    return outputs, errors
+
+
+def main(ocr_text_path: str, stream: bool = False, store_path: str = None):
+    final = run_pipeline(ocr_text_path, stream=stream)
+
+    # 9. Optional persistence (indexed local store)
+    if store_path:
+        with ResultStore(store_path) as store:
+            store.insert_document(final)
 
     print(json.dumps(final, indent=2))
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        raise RuntimeError(
-            "Usage: python -m scripts.run_local_pipeline <ocr_text_path>"
-        )
+    parser = argparse.ArgumentParser(
+        usage="python -m scripts.run_local_pipeline <ocr_text_path> [--stream] [--store DB]"
+    )
+    parser.add_argument("ocr_text_path")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--store", default=None, help="SQLite result store to insert into")
+    args = parser.parse_args()
 
-    main(sys.argv[1])
+    main(args.ocr_text_path, stream=args.stream, store_path=args.store)
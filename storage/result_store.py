@@ -0,0 +1,358 @@
+import json
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+from llm.material_recognizer import default_recognizer
+
+
+# Conversion to a common unit so range queries work across mm / cm / inch
+UNIT_TO_MM = {
+    "mm": 1.0,
+    "cm": 10.0,
+    "inch": 25.4,
+}
+
+# Text queries check filtered rows one by one against FTS only when the
+# other filters match at most this many rows; otherwise FTS hits drive
+FTS_ROW_CHECK_LIMIT = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id            INTEGER PRIMARY KEY,
+    file_name     TEXT NOT NULL,
+    processed_at  TEXT,
+    json_repaired INTEGER NOT NULL DEFAULT 0,
+    payload       TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS dimensions (
+    id          INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    type        TEXT NOT NULL,
+    value       REAL,
+    unit        TEXT,
+    value_mm    REAL,
+    tolerance   TEXT,
+    source_text TEXT,
+    confidence  REAL
+);
+
+CREATE TABLE IF NOT EXISTS materials (
+    id          INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    name        TEXT COLLATE NOCASE,
+    standard    TEXT COLLATE NOCASE,
+    source_text TEXT,
+    confidence  REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_documents_file_name ON documents(file_name);
+CREATE INDEX IF NOT EXISTS idx_dimensions_type_value_unit ON dimensions(type, value_mm, unit);
+CREATE INDEX IF NOT EXISTS idx_dimensions_value_mm ON dimensions(value_mm);
+CREATE INDEX IF NOT EXISTS idx_dimensions_document ON dimensions(document_id);
+CREATE INDEX IF NOT EXISTS idx_materials_name ON materials(name);
+CREATE INDEX IF NOT EXISTS idx_materials_standard ON materials(standard);
+CREATE INDEX IF NOT EXISTS idx_materials_document ON materials(document_id);
+
+-- rowid = dimensions.id, so a filtered row can be checked by rowid
+CREATE VIRTUAL TABLE IF NOT EXISTS dimension_fts USING fts5(
+    source_text,
+    content='dimensions',
+    content_rowid='id'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS note_fts USING fts5(
+    text,
+    document_id UNINDEXED
+);
+"""
+
+
+def to_mm(value, unit: Optional[str]) -> Optional[float]:
+    factor = UNIT_TO_MM.get(unit)
+    if factor is None or not isinstance(value, (int, float)):
+        return None
+    return float(value) * factor
+
+
+def fts_query(text: str) -> str:
+    """
+    Turn user text into a literal FTS5 query: every whitespace-separated
+    term is quoted (implicit AND), so "0.2", "+/-" or "SS304-L" are not
+    parsed as FTS5 syntax. Terms without letters or digits are dropped.
+    """
+    terms = [term for term in text.split() if any(ch.isalnum() for ch in term)]
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _note_text(note) -> Optional[str]:
+    if isinstance(note, dict):
+        return note.get("text")
+    if isinstance(note, str):
+        return note
+    return None
+
+
+class ResultStore:
+    """
+    Local indexed store for processed pipeline outputs.
+
+    SQLite in WAL mode, normalised into documents / dimensions / materials,
+    with an FTS5 index over dimension source_text and notes.
+    """
+
+    def __init__(self, path: str = "data/results.sqlite3"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----------------------------
+    # Writes
+    # ----------------------------
+
+    def insert_documents(self, outputs: Iterable[Dict]) -> List[int]:
+        """
+        Insert final pipeline outputs in a single transaction.
+        Either every document is stored or none is.
+        """
+        ids = []
+
+        with self.conn:
+            for output in outputs:
+                ids.append(self._insert_document(output))
+
+        return ids
+
+    def insert_document(self, output: Dict) -> int:
+        return self.insert_documents([output])[0]
+
+    def _insert_document(self, output: Dict) -> int:
+        metadata = output.get("metadata", {})
+        specs = output.get("specifications", {})
+
+        cur = self.conn.execute(
+            "INSERT INTO documents (file_name, processed_at, json_repaired, payload) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                metadata.get("file_name"),
+                metadata.get("processed_at"),
+                int(bool(metadata.get("json_repaired"))),
+                json.dumps(output),
+            )
+        )
+        doc_id = cur.lastrowid
+
+        dimension_fts_rows = []
+
+        for dim in specs.get("dimensions") or []:
+            cur = self.conn.execute(
+                "INSERT INTO dimensions (document_id, type, value, unit, value_mm, "
+                "tolerance, source_text, confidence) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    doc_id,
+                    dim.get("type"),
+                    dim.get("value"),
+                    dim.get("unit"),
+                    to_mm(dim.get("value"), dim.get("unit")),
+                    dim.get("tolerance"),
+                    dim.get("source_text"),
+                    dim.get("confidence"),
+                )
+            )
+            if dim.get("source_text"):
+                dimension_fts_rows.append((cur.lastrowid, dim["source_text"]))
+
+        material = specs.get("material")
+        if material:
+            self.conn.execute(
+                "INSERT INTO materials (document_id, name, standard, source_text, confidence) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    doc_id,
+                    material.get("name"),
+                    material.get("standard"),
+                    material.get("source_text"),
+                    material.get("confidence"),
+                )
+            )
+
+        note_fts_rows = []
+        for note in specs.get("notes") or []:
+            text = _note_text(note)
+            if text:
+                note_fts_rows.append((text, doc_id))
+
+        self.conn.executemany(
+            "INSERT INTO dimension_fts (rowid, source_text) VALUES (?, ?)",
+            dimension_fts_rows
+        )
+        self.conn.executemany(
+            "INSERT INTO note_fts (text, document_id) VALUES (?, ?)",
+            note_fts_rows
+        )
+
+        return doc_id
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+
+    def query_dimensions(
+        self,
+        type: Optional[str] = None,
+        value_mm: Optional[float] = None,
+        tolerance_mm: float = 0.0,
+        min_mm: Optional[float] = None,
+        max_mm: Optional[float] = None,
+        unit: Optional[str] = None,
+        material: Optional[str] = None,
+        text: Optional[str] = None,
+        raw: bool = False,
+        limit: int = 100
+    ) -> List[Dict]:
+        """
+        Range / text query over stored dimensions.
+
+        `value_mm` +/- `tolerance_mm` is shorthand for a min/max range.
+        `material` matches material name or standard (case-insensitive);
+        catalog designations are canonicalized first, so "SS304" finds
+        materials stored as "AISI 304".
+        `text` matches dimension source_text literally; with `raw=True`
+        it is passed through as FTS5 query syntax.
+        """
+        if value_mm is not None:
+            min_mm = value_mm - tolerance_mm
+            max_mm = value_mm + tolerance_mm
+
+        clauses = []
+        params: List = []
+
+        if type is not None:
+            clauses.append("d.type = ?")
+            params.append(type)
+        if min_mm is not None:
+            clauses.append("d.value_mm >= ?")
+            params.append(min_mm)
+        if max_mm is not None:
+            clauses.append("d.value_mm <= ?")
+            params.append(max_mm)
+        if unit is not None:
+            clauses.append("d.unit = ?")
+            params.append(unit)
+        if material is not None:
+            match = default_recognizer().canonicalize(material)
+            standard = match["standard"] if match else material
+            clauses.append(
+                "d.document_id IN (SELECT document_id FROM materials "
+                "WHERE name = ? OR standard = ? OR standard = ?)"
+            )
+            params.extend([material, material, standard])
+        source = "dimensions d"
+        source_params: List = []
+
+        if text is not None:
+            query = text if raw else fts_query(text)
+            if not query:
+                return []
+
+            if clauses and self._few_rows(clauses, params):
+                # narrow filters: check each filtered row by rowid
+                clauses.append(
+                    "EXISTS (SELECT 1 FROM dimension_fts "
+                    "WHERE dimension_fts MATCH ? AND rowid = d.id)"
+                )
+                params.append(query)
+            else:
+                # loose or no filters: the hit set drives the query (CROSS JOIN
+                # keeps that order) and stops at `limit`, so a loose filter
+                # never costs one FTS lookup per row
+                source = (
+                    "(SELECT rowid AS id FROM dimension_fts WHERE dimension_fts MATCH ?) hit "
+                    "CROSS JOIN dimensions d ON d.id = hit.id"
+                )
+                source_params.append(query)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        rows = self.conn.execute(
+            "SELECT d.id, d.document_id, doc.file_name, d.type, d.value, d.unit, "
+            "d.value_mm, d.tolerance, d.source_text, d.confidence "
+            f"FROM {source} JOIN documents doc ON doc.id = d.document_id "
+            f"{where} LIMIT ?",
+            (*source_params, *params, limit)
+        ).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def _few_rows(self, clauses: List[str], params: List) -> bool:
+        """
+        True when the non-text filters match at most FTS_ROW_CHECK_LIMIT
+        dimensions. The probe stops at the limit, so it stays cheap.
+        """
+        count = self.conn.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM dimensions d "
+            f"WHERE {' AND '.join(clauses)} LIMIT ?)",
+            (*params, FTS_ROW_CHECK_LIMIT + 1)
+        ).fetchone()[0]
+        return count <= FTS_ROW_CHECK_LIMIT
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        raw: bool = False,
+        limit: int = 100
+    ) -> List[Dict]:
+        """
+        Full-text search over dimension source_text and notes.
+        `query` is matched literally unless `raw=True` (FTS5 syntax).
+        """
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+
+        parts = []
+        params: List = []
+
+        if kind in (None, "dimension"):
+            parts.append(
+                "SELECT d.source_text AS text, 'dimension' AS kind, d.document_id, "
+                "d.id AS ref_id, doc.file_name "
+                "FROM dimension_fts f JOIN dimensions d ON d.id = f.rowid "
+                "JOIN documents doc ON doc.id = d.document_id "
+                "WHERE dimension_fts MATCH ?"
+            )
+            params.append(match)
+
+        if kind in (None, "note"):
+            parts.append(
+                "SELECT n.text, 'note' AS kind, n.document_id, NULL AS ref_id, doc.file_name "
+                "FROM note_fts n JOIN documents doc ON doc.id = n.document_id "
+                "WHERE note_fts MATCH ?"
+            )
+            params.append(match)
+
+        sql = " UNION ALL ".join(parts) + " LIMIT ?"
+        params.append(limit)
+
+        return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def get_document(self, document_id: int) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT payload FROM documents WHERE id = ?", (document_id,)
+        ).fetchone()
+        return json.loads(row["payload"]) if row else None
@@ -0,0 +1,22 @@
+from scripts.benchmark_stages import compare_results, make_ocr_text, make_dimensions
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = {"preprocess[10_lines]": 1.0, "postprocess[10_dims]": 1.0}
+    current = {
+        "preprocess[10_lines]": 1.2,
+        "postprocess[10_dims]": 1.5,
+        "score_dimension[10_dims]": 9.0,
+    }
+
+    report = {row["name"]: row for row in compare_results(current, baseline, threshold=0.25)}
+
+    assert report["preprocess[10_lines]"]["regressed"] is False
+    assert report["postprocess[10_dims]"]["regressed"] is True
+    assert report["score_dimension[10_dims]"]["baseline"] is None
+    assert report["score_dimension[10_dims]"]["regressed"] is False
+
+
+def test_fixtures_scale_to_requested_size():
+    assert len(make_ocr_text(1000).splitlines()) == 1000
+    assert len(make_dimensions(10)) == 10
@@ -1,5 +1,7 @@
 from llm.confidence_scoring import ConfidenceScorer
 from llm.grounding import GroundingEngine
+from llm.material_recognizer import MaterialRecognizer
+from llm.llm_adapter import material_from_ocr, canonicalize_material
 
 
 def test_confidence_penalized_when_grounding_fails():
@@ -22,3 +24,70 @@ def test_confidence_penalized_when_grounding_fails():
 
     assert grounded["grounding"]["matched"] is False
     assert grounded["confidence"] < 0.8
+
+
+def test_material_catalog_recognizes_noisy_grade():
+    recognizer = MaterialRecognizer()
+
+    match = recognizer.recognize("DIAMETER 10mm +/- 0.2\nMAT: SS3O4")
+
+    assert match["standard"] == "AISI 304"
+    assert match["source_text"] == "SS3O4"
+    assert match["noisy"] is True
+    # bare numbers are dimensions, not materials
+    assert recognizer.recognize("LENGTH 304 mm") is None
+
+
+def test_catalog_material_scores_above_unknown_material():
+    scorer = ConfidenceScorer()
+
+    known = scorer.score_material({"standard": "AISI 316L", "source_text": "SUS316L"})
+    noisy = scorer.score_material({"standard": "AISI 316L", "source_text": "SUS3l6L"})
+    unknown = scorer.score_material({"standard": None, "source_text": "SS999X"})
+
+    assert unknown < noisy < known
+
+    # the canonical standard alone is no evidence; the LLM's own must agree
+    agreed = scorer.score_material(
+        {"standard": "AISI 316L", "source_text": "SUS316L"}, reported_standard="SS316L"
+    )
+    disagreed = scorer.score_material(
+        {"standard": "AISI 316L", "source_text": "SUS316L"}, reported_standard="SS304"
+    )
+    assert agreed == 1.0
+    assert disagreed == known < agreed
+
+
+def test_llm_material_without_ocr_evidence_scores_below_ocr_catalog_hit():
+    scorer = ConfidenceScorer()
+    ocr_text = "DIAMETER 10mm +/- 0.2"
+
+    from_ocr = scorer.score_material(material_from_ocr("MAT: SS304"), "MAT: SS304")
+    no_source = canonicalize_material({"name": "Stainless Steel", "standard": "SS304"})
+    not_in_ocr = {"name": "Stainless Steel", "standard": "AISI 304", "source_text": "SS304"}
+
+    assert "source_text" not in no_source
+    assert scorer.score_material(no_source, ocr_text) < from_ocr
+    assert scorer.score_material(not_in_ocr, ocr_text) < from_ocr
+
+
+def test_material_match_does_not_run_into_next_token():
+    recognizer = MaterialRecognizer()
+
+    match = recognizer.recognize("MAT: SS304 L 50")
+    assert match["standard"] == "AISI 304"
+    assert match["source_text"] == "SS304"
+
+    assert recognizer.recognize("POM C")["source_text"] == "POM"
+    assert recognizer.recognize("SUS 304")["standard"] == "AISI 304"
+
+
+def test_single_letter_callouts_are_not_materials():
+    recognizer = MaterialRecognizer()
+
+    for callout in ("CHAMFER C 45°", "DETAIL C 45", "C 360", "A 2024"):
+        assert recognizer.recognize(callout) is None, callout
+
+    # a designation on the material line wins over one earlier in the drawing
+    match = recognizer.recognize("CHAMFER C45\nMAT: SS3O4")
+    assert match["standard"] == "AISI 304"
@@ -0,0 +1,275 @@
+import json
+
+import pytest
+
+from llm.stream_parser import IncrementalDimensionParser
+from llm.json_repair import parse_llm_json, JSONRepairError, RepairMetrics, REPAIRED_FLAG
+from llm.prompt_packing import extract_packed, pack_documents
+from llm.llm_client_openrouter import OpenRouterClient
+from scripts.run_local_pipeline import run_pipeline, run_packed_pipeline
+
+
+def test_stream_parser_emits_dimensions_as_they_close():
+    document = {
+        "material": {"name": "Stainless Steel", "standard": "SS304"},
+        "dimensions": [
+            {"value": 10, "unit": "mm", "source_text": "DIAMETER 10mm {\"x\"}"},
+            {"value": 20, "unit": "mm", "source_text": "LENGTH 20mm [A]"},
+        ],
+        "manufacturing_notes": [{"dimensions": [{"value": 99}]}]
+    }
+    text = "```json\n" + json.dumps(document) + "\n```"
+
+    parser = IncrementalDimensionParser()
+    emitted = []
+    first_emitted_at = None
+
+    for i in range(0, len(text), 7):
+        emitted.extend(parser.feed(text[i:i + 7]))
+        if emitted and first_emitted_at is None:
+            first_emitted_at = i
+
+    assert emitted == document["dimensions"]
+    # first dimension is available before the second one is streamed
+    assert first_emitted_at < text.index("LENGTH")
+
+
+def test_stream_parser_repairs_damaged_elements_like_final_reply():
+    text = (
+        '{"dimensions": [{"value": 10, "unit": "mm", "source_text": "DIAMETER 10mm",}, '
+        '{"value": 20, "unit": "mm", "tolerance": {"plus": 0.1,}, "source_text": "LENGTH 20mm"}]}'
+    )
+
+    emitted = IncrementalDimensionParser().feed(text)
+
+    assert emitted == parse_llm_json(text)["dimensions"]
+    assert [d["value"] for d in emitted] == [10, 20]
+
+
+def test_json_repair_salvages_complete_dimensions_from_truncated_output():
+    raw = (
+        'Sure, here is the JSON:\n```json\n'
+        '{"dimensions": [{"value": 10, "unit": "mm", "source_text": "DIAMETER 10mm",}, '
+        '{"value": 20, "unit": "m'
+    )
+
+    data = parse_llm_json(raw)
+
+    assert data["dimensions"] == [
+        {"value": 10, "unit": "mm", "source_text": "DIAMETER 10mm"}
+    ]
+    assert data[REPAIRED_FLAG] is True
+
+
+def test_json_repair_rejects_unrecoverable_output():
+    with pytest.raises(JSONRepairError):
+        parse_llm_json("I could not read the drawing.")
+
+    with pytest.raises(JSONRepairError):
+        parse_llm_json("{")
+
+
+def test_json_repair_rejects_reply_truncated_inside_first_dimension():
+    with pytest.raises(JSONRepairError):
+        parse_llm_json('{"dimensions": [{"value": 10, "unit": "m')
+
+    with pytest.raises(JSONRepairError):
+        parse_llm_json('{"material": {"name": "SS304"}, "dimensions": [{"value": 10, "unit": "m')
+
+
+class FakePackedClient:
+    """Answers packed prompts, dropping DOC2 from the first response."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def extract(self, system_prompt, user_prompt, required_key="dimensions", max_attempts=3):
+        self.prompts.append(user_prompt)
+        ids = [i for i in ("DOC1", "DOC2", "DOC3") if f'id="{i}"' in user_prompt]
+        if len(self.prompts) == 1:
+            ids.remove("DOC2")
+        return {
+            doc_id: {"dimensions": [{"value": 10, "unit": "mm", "source_text": f"{doc_id} DIAMETER 10mm"}]}
+            for doc_id in ids
+        }
+
+
+def test_packed_extraction_reissues_only_missing_documents():
+    documents = {
+        "DOC1": "DIAMETER 10mm +/- 0.2",
+        "DOC2": "LENGTH 20mm",
+        "DOC3": "MAT: SS304",
+    }
+    client = FakePackedClient()
+
+    results, missing = extract_packed(client, "system", "{{DOCUMENTS}}", documents, token_budget=1000)
+
+    assert missing == []
+    assert sorted(results) == ["DOC1", "DOC2", "DOC3"]
+    assert len(client.prompts) == 2
+    assert 'id="DOC2"' in client.prompts[1] and 'id="DOC1"' not in client.prompts[1]
+
+
+def test_packed_extraction_reissues_malformed_documents():
+    dimension = {"value": 10, "unit": "mm", "source_text": "DIAMETER 10mm"}
+    replies = [
+        {"DOC1": {"dimensions": [dimension]}, "DOC2": {"dimensions": ["LENGTH 20mm"]},
+         "DOC3": {"dimensions": {"value": 20}}},
+        {"DOC2": {"dimensions": [dimension]}, "DOC3": {"dimensions": [dimension]}},
+    ]
+
+    class Client:
+        def __init__(self):
+            self.prompts = []
+
+        def extract(self, system_prompt, user_prompt, required_key="dimensions", max_attempts=3):
+            self.prompts.append(user_prompt)
+            return replies[len(self.prompts) - 1]
+
+    client = Client()
+    documents = {"DOC1": "DIAMETER 10mm", "DOC2": "LENGTH 20mm", "DOC3": "WIDTH 20mm"}
+
+    results, missing = extract_packed(client, "system", "{{DOCUMENTS}}", documents, token_budget=1000)
+
+    assert missing == []
+    assert results["DOC2"]["dimensions"] == [dimension]
+    assert 'id="DOC1"' not in client.prompts[1]
+
+
+def test_packed_extraction_shares_one_retry_budget(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("llm.prompt_packing.time.sleep", sleeps.append)
+
+    class RateLimitedClient:
+        def __init__(self):
+            self.attempts = []
+
+        def extract(self, system_prompt, user_prompt, required_key="dimensions", max_attempts=3):
+            self.attempts.append(max_attempts)
+            raise RuntimeError("OpenRouter request failed after retries.")
+
+    client = RateLimitedClient()
+
+    results, missing = extract_packed(client, "system", "{{DOCUMENTS}}", {"DOC1": "LENGTH 20mm"}, max_rounds=3)
+
+    assert results == {} and missing == ["DOC1"]
+    # one single-attempt request per round, backing off between rounds only
+    assert client.attempts == [1, 1, 1]
+    assert len(sleeps) == 2 and sleeps[0] < sleeps[1]
+
+
+def test_pack_documents_respects_token_budget():
+    documents = {f"DOC{i}": "x" * 400 for i in range(1, 6)}
+
+    packs = pack_documents(documents, token_budget=250)
+
+    assert [len(pack) for pack in packs] == [2, 2, 1]
+
+
+def test_packed_pipeline_isolates_badly_shaped_document(tmp_path):
+    good, bad = tmp_path / "good.txt", tmp_path / "bad.txt"
+    good.write_text("Ø 10 mm ± 0.2")
+    bad.write_text("LENGTH 20 mm")
+
+    class Client:
+        metrics = RepairMetrics()
+
+        def extract(self, system_prompt, user_prompt, required_key="dimensions", max_attempts=3):
+            return {
+                "DOC1": {"dimensions": [{"value": 10, "unit": "mm", "source_text": "DIAMETER 10mm +/- 0.2"}]},
+                "DOC2": {"dimensions": ["LENGTH 20mm"]},
+            }
+
+    outputs, errors = run_packed_pipeline([str(good), str(bad)], client=Client())
+
+    assert [o["metadata"]["file_name"] for o in outputs] == ["good.txt"]
+    assert list(errors) == ["bad.txt"]
+
+
+class FakeSSEResponse:
+    status_code = 200
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self.lines)
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def sse_lines(content, chunk=9):
+    lines = [": OPENROUTER PROCESSING", ""]
+    for i in range(0, len(content), chunk):
+        event = {"choices": [{"delta": {"content": content[i:i + chunk]}}]}
+        lines += [f"data: {json.dumps(event)}", ""]
+    lines += ["data: [DONE]", "data: {\"error\": \"after DONE is ignored\"}"]
+    return lines
+
+
+STREAMED_REPLY = json.dumps({
+    "dimensions": [
+        {"value": 10, "unit": "mm", "source_text": "DIAMETER 10mm +/- 0.2"},
+        {"value": 20, "unit": "mm", "source_text": "LENGTH 20mm"},
+    ],
+    "material": {"name": "Stainless Steel", "standard": "SS304"},
+    "manufacturing_notes": []
+})
+
+
+@pytest.fixture
+def openrouter(monkeypatch):
+    monkeypatch.setenv("OPEN_ROUTER_API_KEY", "test")
+    responses = []
+    monkeypatch.setattr(
+        "llm.llm_client_openrouter.requests.post",
+        lambda *args, **kwargs: responses.pop(0)
+    )
+    return OpenRouterClient(), responses
+
+
+def test_extract_stream_delivers_dimensions_and_skips_keep_alives(openrouter):
+    client, responses = openrouter
+    responses.append(FakeSSEResponse(sse_lines(STREAMED_REPLY)))
+    received = []
+
+    data = client.extract_stream("system", "user", on_dimension=received.append)
+
+    assert received == json.loads(STREAMED_REPLY)["dimensions"]
+    assert data == json.loads(STREAMED_REPLY)
+
+
+def test_extract_stream_raises_on_error_event(openrouter):
+    client, responses = openrouter
+    responses.append(FakeSSEResponse([
+        ": OPENROUTER PROCESSING",
+        'data: {"choices": [{"delta": {"content": "{\\"dimensions\\": ["}}]}',
+        'data: {"error": {"message": "provider overloaded"}}',
+    ]))
+
+    with pytest.raises(RuntimeError, match="provider overloaded"):
+        client.extract_stream("system", "user", on_dimension=lambda dim: None)
+
+
+def test_run_pipeline_stream_uses_streamed_dimensions(openrouter, tmp_path):
+    client, responses = openrouter
+    responses.append(FakeSSEResponse(sse_lines(STREAMED_REPLY)))
+    ocr = tmp_path / "drawing.txt"
+    ocr.write_text("Ø 10 mm ± 0.2\nLENGTH 20 mm\nMAT: SS304")
+
+    final = run_pipeline(str(ocr), stream=True, client=client)
+
+    dims = final["specifications"]["dimensions"]
+    assert [(d["type"], d["value"]) for d in dims] == [("diameter", 10), ("length", 20)]
+    assert all(d["confidence"] > 0 for d in dims)
+    assert final["specifications"]["material"]["standard"] == "AISI 304"
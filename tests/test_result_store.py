@@ -0,0 +1,87 @@
+from storage.result_store import ResultStore, FTS_ROW_CHECK_LIMIT
+from scripts import query_results
+from llm.llm_adapter import material_from_ocr
+
+
+def make_output(file_name, value, unit, standard, note):
+    return {
+        "metadata": {"file_name": file_name, "processed_at": "2025-01-01T00:00:00Z"},
+        "specifications": {
+            "dimensions": [
+                {
+                    "type": "diameter",
+                    "value": value,
+                    "unit": unit,
+                    "tolerance": None,
+                    "source_text": f"DIAMETER {value}{unit} +/- 0.2",
+                    "confidence": 0.9
+                }
+            ],
+            "material": {"name": "Stainless Steel", "standard": standard},
+            "notes": [{"text": note}]
+        }
+    }
+
+
+def test_range_material_and_text_queries(tmp_path):
+    with ResultStore(str(tmp_path / "results.sqlite3")) as store:
+        store.insert_documents([
+            make_output("a.txt", 10, "mm", "SS304", "DEBURR ALL EDGES"),
+            make_output("b.txt", 1, "cm", "SS316", "BREAK SHARP CORNERS"),
+            make_output("c.txt", 25, "mm", "SS304", "PAINT"),
+        ])
+
+        hits = store.query_dimensions(type="diameter", value_mm=10, tolerance_mm=0.2)
+        assert sorted(h["file_name"] for h in hits) == ["a.txt", "b.txt"]
+
+        hits = store.query_dimensions(type="diameter", value_mm=10, tolerance_mm=0.2, material="ss304")
+        assert [h["file_name"] for h in hits] == ["a.txt"]
+
+        notes = store.search("deburr", kind="note")
+        assert [n["file_name"] for n in notes] == ["a.txt"]
+
+        assert store.query_dimensions(text='"25mm"')[0]["file_name"] == "c.txt"
+
+
+def test_text_queries_are_literal_unless_raw(tmp_path):
+    db = str(tmp_path / "results.sqlite3")
+    with ResultStore(db) as store:
+        store.insert_documents([make_output("a.txt", 10, "mm", "SS304", "DEBURR ALL EDGES")])
+
+        hits = store.search("DIAMETER 10mm +/- 0.2", kind="dimension")
+        assert [h["file_name"] for h in hits] == ["a.txt"]
+        assert store.search("SS304-L") == []
+
+        hits = store.query_dimensions(text="0.2", type="diameter", value_mm=10, tolerance_mm=0.2)
+        assert [h["file_name"] for h in hits] == ["a.txt"]
+
+    assert query_results.main(["--db", db, "search", "0.2 AND", "--raw"]) == 2
+
+
+def test_material_query_matches_canonical_catalog_standard(tmp_path):
+    output = make_output("a.txt", 10, "mm", "SS304", "DEBURR ALL EDGES")
+    output["specifications"]["material"] = material_from_ocr("MAT: SS304")
+
+    with ResultStore(str(tmp_path / "results.sqlite3")) as store:
+        store.insert_document(output)
+
+        for query in ("SS304", "SUS304", "AISI 304"):
+            hits = store.query_dimensions(type="diameter", value_mm=10, material=query)
+            assert [h["file_name"] for h in hits] == ["a.txt"]
+
+
+def test_loose_filter_with_rare_term_uses_fts_hit_set(tmp_path):
+    outputs = [
+        make_output(f"{i}.txt", i % 50 + 1, "mm", "SS304", "PAINT")
+        for i in range(FTS_ROW_CHECK_LIMIT + 50)
+    ]
+    outputs[-1]["specifications"]["dimensions"][0]["source_text"] = "DIAMETER 7mm ZZZZ"
+
+    with ResultStore(str(tmp_path / "results.sqlite3")) as store:
+        store.insert_documents(outputs)
+
+        hits = store.query_dimensions(text="ZZZZ", type="diameter")
+        assert [h["file_name"] for h in hits] == [outputs[-1]["metadata"]["file_name"]]
+
+        assert store.query_dimensions(text="ZZZZ", min_mm=0) == hits
+        assert store.query_dimensions(text="ZZZZ", type="diameter", value_mm=1) == []